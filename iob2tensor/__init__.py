@@ -1,3 +1,3 @@
-from .labels import create_label_map, format_entity_label
+from .labels import create_label_map, create_entity_pair_map, format_entity_label
 from .annotations import Annotation, preprocessing
-from .convert import to_iob_tensor
+from .convert import to_iob_tensor, to_iob_tensor_batch
@@ -1,3 +1,5 @@
+from collections.abc import Iterable, Mapping
+from operator import itemgetter
 from typing import Any
 from typing_extensions import TypedDict
 
@@ -24,6 +26,15 @@ class _AnnotationFormat(BaseModel):
     text: StrictStr
     spans: list[_SpanFormat]
 
+def _span_fields(span: Any, idx: int, start_field: str, end_field: str, label_field: str) -> tuple[Any, Any, Any]:
+    """Look up the (start, end, label) values of an input span, reporting a missing field by span index."""
+    if not isinstance(span, Mapping):
+        raise TypeError(f"Span {idx} must be a dict. Got type '{type(span).__name__}'.")
+    try:
+        return span[start_field], span[end_field], span[label_field]
+    except KeyError as error:
+        raise ValueError(f"Span {idx} is missing field {error}.") from None
+
 def convert_to_validated_format(
     text: str,
     spans: list[dict],
@@ -36,10 +47,12 @@ def convert_to_validated_format(
         text=text,
         spans=[
             _SpanFormat(
-                start=span[start_field],
-                end=span[end_field],
-                label=span[label_field]
-            ) for span in spans
+                start=start,
+                end=end,
+                label=label
+            ) for start, end, label in (
+                _span_fields(span, idx, start_field, end_field, label_field) for idx, span in enumerate(spans)
+            )
         ]
     )
 
@@ -54,17 +67,54 @@ class Annotation(TypedDict):
     text: str
     spans: list[Span]
 
+def _sorted_validated_spans(text: str, span_tuples: list[tuple[int, int, str, int]]) -> list[Span]:
+    """Validate `(start, end, label, input_index)` span tuples against the text and each other in one sorted
+    pass, materializing spans (ordered by start index) as typed dicts only once all checks have passed."""
+    text_length = len(text)
+    span_tuples.sort(key=itemgetter(0, 1))
+    prev_idx, prev_end = None, 0
+    for start, end, label, idx in span_tuples:
+        if not 0 <= start < end <= text_length:
+            raise ValueError(f"Span {idx} ({start}, {end}) must satisfy 0 <= start < end <= {text_length} (length of text).")
+        if prev_idx is not None and start < prev_end:
+            raise ValueError(f"Spans {prev_idx} (ending at {prev_end}) and {idx} (starting at {start}) overlap.")
+        prev_idx, prev_end = idx, end
+    return [Span(start=start, end=end, label=label) for start, end, label, _ in span_tuples]
+
 def preprocessing(
     text: str,
     spans: list[dict],
     start_field: str = DefaultFields.START,
     end_field: str = DefaultFields.END,
-    label_field: str = DefaultFields.LABEL
+    label_field: str = DefaultFields.LABEL,
+    strict_validate: bool = False
 ) -> Annotation:
-    # first convert to pydantic models to convert and validate input data
-    validated = convert_to_validated_format(text, spans, start_field, end_field, label_field)
+    """Validate an annotation and return it with spans in the default field names, sorted by start index. Raises
+    `TypeError` for input of the wrong type and `ValueError` for missing span fields, or invalid span positions."""
+    if isinstance(spans, (str, bytes, Mapping)) or not isinstance(spans, Iterable):
+        raise TypeError(f"Input spans must be a list of span dicts. Got type '{type(spans).__name__}'.")
+
+    if strict_validate:
+        # convert to pydantic models to convert and validate input data
+        try:
+            validated = convert_to_validated_format(text, spans, start_field, end_field, label_field)
+        except ValidationError as error:
+            raise TypeError(f"Input annotation failed validation.\n{error}") from None
+        text = validated.text
+        span_tuples = [(span.start, span.end, span.label, idx) for idx, span in enumerate(validated.spans)]
+    else:
+        # otherwise, apply the same type checks (and conversions) directly to skip the pydantic round-trip
+        if not isinstance(text, str):
+            raise TypeError(f"Input text must be a string. Got type '{type(text).__name__}'.")
+        text = str(text)
+        span_tuples = []
+        for idx, span in enumerate(spans):
+            start, end, label = _span_fields(span, idx, start_field, end_field, label_field)
+            if isinstance(start, bool) or isinstance(end, bool) or not (isinstance(start, int) and isinstance(end, int) and isinstance(label, str)):
+                raise TypeError(f"Span {idx} must have integer start/end and string label fields. Got {span}.")
+            span_tuples.append((int(start), int(end), str(label), idx))
     # return as typed dict
-    return Annotation(**validated.model_dump())
+    return Annotation(text=text, spans=_sorted_validated_spans(text, span_tuples))
 
 def validate_batch(
     annotations: list[dict],
@@ -74,9 +124,10 @@ def validate_batch(
     end_field: str = DefaultFields.END,
     label_field: str = DefaultFields.LABEL
 ) -> list[Annotation]:
-    assert isinstance(annotations, list) and all([isinstance(ann, dict) for ann in annotations]), f"Input for annotations is not a list of dicts."
+    if not (isinstance(annotations, list) and all(isinstance(ann, dict) for ann in annotations)):
+        raise TypeError(f"Input for annotations is not a list of dicts.")
     return [
-        validate(
+        preprocessing(
             text=ann[text_field],
             spans=ann[spans_field],
             start_field=start_field,
@@ -1,66 +1,129 @@
 from itertools import takewhile
+from typing import TYPE_CHECKING
 
-from transformers import PreTrainedTokenizer
+import numpy as np
 
-from iob2tensor.labels import IobPrefixes, IGNORE_TOKEN
+from iob2tensor.labels import IobPrefixes, IGNORE_TOKEN, create_entity_pair_map
 from iob2tensor.annotations import Annotation, DefaultFields
 
+if TYPE_CHECKING: # <- only needed for annotations; avoids importing transformers with the package
+    from transformers import PreTrainedTokenizer
+
 def invert_label_map(label_map: dict[str, int]) -> dict[int, str]:
  return {v: k for k, v in label_map.items()}
 
-def get_iob_type_by_iob_label(label_map: dict[str, int], iob_label: int) -> str:
-    if iob_label == IGNORE_TOKEN:
-        iob_type = IobPrefixes.OUTSIDE
-    else:
-        idx_map = invert_label_map(label_map)
-        iob_type = idx_map[iob_label]
-    return iob_type[0]
+def build_iob_type_table(label_map: dict[str, int], ignore_token: int = IGNORE_TOKEN) -> dict[int, str]:
+    """Precompute label index -> IOB prefix ('B', 'I', 'O') lookup, with the ignore token treated as outside."""
+    iob_types = {idx: tag[0] for tag, idx in label_map.items()}
+    iob_types[ignore_token] = IobPrefixes.OUTSIDE
+    return iob_types
+
+def get_iob_type_by_iob_label(label_map: dict[str, int], iob_label: int, iob_types: dict[int, str] | None = None) -> str:
+    if iob_types is None:
+        iob_types = build_iob_type_table(label_map)
+    return iob_types[iob_label]
 
-def is_beginning_tag(label_map: dict[str, int], iob_label: int) -> bool:
+def is_beginning_tag(label_map: dict[str, int], iob_label: int, iob_types: dict[int, str] | None = None) -> bool:
     """Boolean check if label associated with input index is a beginning tag."""
-    return get_iob_type_by_iob_label(label_map, iob_label) == IobPrefixes.BEGINNING
+    return get_iob_type_by_iob_label(label_map, iob_label, iob_types) == IobPrefixes.BEGINNING
 
-def is_inside_tag(label_map: dict[str, int], iob_label: int) -> bool:
+def is_inside_tag(label_map: dict[str, int], iob_label: int, iob_types: dict[int, str] | None = None) -> bool:
     """Boolean check if label associated with input index is an inside tag."""
-    return get_iob_type_by_iob_label(label_map, iob_label) == IobPrefixes.INSIDE
+    return get_iob_type_by_iob_label(label_map, iob_label, iob_types) == IobPrefixes.INSIDE
 
-def is_outside_tag(label_map: dict[str, int], iob_label: int) -> bool:
+def is_outside_tag(label_map: dict[str, int], iob_label: int, iob_types: dict[int, str] | None = None) -> bool:
     """Boolean check if label associated with input index is an outside tag."""
-    return get_iob_type_by_iob_label(label_map, iob_label) == IobPrefixes.OUTSIDE
-
-
-
-def get_entity_sequence_length(label_map: dict[str, int], iob_labels: list[int]) -> int:
-    return len(list(takewhile(lambda x: is_inside_tag(label_map, x), iob_labels)))
-
-def get_entity_index_ranges(label_map: dict[str, int], iob_labels: list[int]) -> list[tuple[int, int]]:
-    return [
-        (idx, idx + get_entity_sequence_length(label_map, iob_labels[(idx + 1):]))
-        for idx in range(len(iob_labels)) if is_beginning_tag(label_map, iob_labels[idx])
-    ]
+    return get_iob_type_by_iob_label(label_map, iob_label, iob_types) == IobPrefixes.OUTSIDE
+
+
+
+def get_entity_sequence_length(label_map: dict[str, int], iob_labels: list[int], iob_types: dict[int, str] | None = None) -> int:
+    if iob_types is None:
+        iob_types = build_iob_type_table(label_map)
+    return len(list(takewhile(lambda x: is_inside_tag(label_map, x, iob_types), iob_labels)))
+
+## -- below this sequence length, numpy call overhead outweighs a plain python scan
+## -- (measured: the scan is faster up to a few hundred labels, even for array input)
+VECTORIZE_MIN_LENGTH = 512
+
+def _get_entity_index_ranges_vectorized(iob_labels: list[int], iob_types: dict[int, str]) -> list[tuple[int, int]]:
+    labels = np.asarray(iob_labels, dtype=np.int64)
+    # as with the python scan's lookups, labels missing from the type table are an error
+    unknown = np.flatnonzero(~np.isin(labels, list(iob_types)))
+    if unknown.size:
+        raise KeyError(int(labels[unknown[0]]))
+    beginning = [idx for idx, iob_type in iob_types.items() if iob_type == IobPrefixes.BEGINNING]
+    inside = [idx for idx, iob_type in iob_types.items() if iob_type == IobPrefixes.INSIDE]
+    starts = np.flatnonzero(np.isin(labels, beginning))
+    # each range ends just before the first non-inside label following its beginning tag
+    breaks = np.append(np.flatnonzero(~np.isin(labels, inside)), len(labels))
+    ends = breaks[np.searchsorted(breaks, starts, side="right")] - 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def get_entity_index_ranges(label_map: dict[str, int], iob_labels: list[int], iob_types: dict[int, str] | None = None) -> list[tuple[int, int]]:
+    if iob_types is None:
+        iob_types = build_iob_type_table(label_map)
+    if len(iob_labels) >= VECTORIZE_MIN_LENGTH:
+        return _get_entity_index_ranges_vectorized(iob_labels, iob_types)
+    # single pass: each beginning tag opens a range which extends over the inside tags that follow it
+    ranges = []
+    idx, num_labels = 0, len(iob_labels)
+    while idx < num_labels:
+        if iob_types[iob_labels[idx]] == IobPrefixes.BEGINNING:
+            end = idx + 1
+            while end < num_labels and iob_types[iob_labels[end]] == IobPrefixes.INSIDE:
+                end += 1
+            ranges.append((idx, end - 1))
+            idx = end
+        else:
+            idx += 1
+    return ranges
 
 def check_iob_conversion(
     iob_labels: list[int],
     label_map: dict[str, int],
-    tokenizer: PreTrainedTokenizer,
+    tokenizer: "PreTrainedTokenizer",
     input_ids: list[int],
     annotation: Annotation,
     debug: bool = False,
     strict: bool = True,
+    offsets: list[tuple[int, int]] | None = None,
 ) -> None:
-    """Tests to ensure assigned IOB labels are correct based on character and token indices for annotated entities."""
-    match_ranges = get_entity_index_ranges(label_map, iob_labels)
-    num_ranges, num_spans = len(match_ranges), len(annotation[DefaultFields.SPANS])
-    assert num_ranges == num_spans, f"Test found {num_ranges} matches but annotation includes {num_spans} entities."
-
-    for _range, span in zip(match_ranges, annotation[DefaultFields.SPANS]):
-        # recover entity from IOB positive label indices
-        entity_input_ids = input_ids[_range[0]: (_range[1] + 1)]
-        recovered_entity = tokenizer.decode(entity_input_ids).strip() # <- some tokenizers (e.g., Roberta-Base), can include leading whitespace in decoded entity
-
-        # encode/decode annotated entity and assert equality
-        annotated_entity = annotation[DefaultFields.TEXT][span[DefaultFields.START]:span[DefaultFields.END]]
-        expected_entity = tokenizer.decode(tokenizer.encode(annotated_entity, add_special_tokens=False))
+    """Tests to ensure assigned IOB labels are correct based on character and token indices for annotated entities.
+    If token character `offsets` are provided, recovered entities are sliced from the text directly; otherwise
+    they are recovered by decoding token ids (and compared against a tokenizer round-trip of the entity)."""
+    iob_types = build_iob_type_table(label_map)
+    spans = annotation[DefaultFields.SPANS]
+
+    # compare entity count, then (ordered) entity labels, of beginning tags against annotated spans before any text checks
+    labels = np.asarray(iob_labels, dtype=np.int64)
+    beginning = [idx for idx, iob_type in iob_types.items() if iob_type == IobPrefixes.BEGINNING]
+    beginning_labels = labels[np.isin(labels, beginning)]
+    num_matches, num_spans = len(beginning_labels), len(spans)
+    assert num_matches == num_spans, f"Test found {num_matches} matches but annotation includes {num_spans} entities."
+    entity_pairs = create_entity_pair_map(label_map)
+    expected_labels = np.fromiter(
+        (entity_pairs[span[DefaultFields.LABEL].upper()][0] for span in spans),
+        dtype=np.int64,
+        count=num_spans
+    )
+    assert np.array_equal(beginning_labels, expected_labels), f"Entity labels assigned via beginning tags {beginning_labels.tolist()} do not match annotated entity labels {expected_labels.tolist()}."
+
+    match_ranges = get_entity_index_ranges(label_map, iob_labels, iob_types)
+    text = annotation[DefaultFields.TEXT]
+    for _range, span in zip(match_ranges, spans):
+        annotated_entity = text[span[DefaultFields.START]:span[DefaultFields.END]]
+        if offsets is not None:
+            # recover entity as the text covered by the labeled tokens, no tokenizer round-trip needed
+            recovered_entity = text[offsets[_range[0]][0]:offsets[_range[1]][1]].strip()
+            expected_entity = annotated_entity.strip()
+        else:
+            # recover entity from IOB positive label indices
+            entity_input_ids = input_ids[_range[0]: (_range[1] + 1)]
+            recovered_entity = tokenizer.decode(entity_input_ids).strip() # <- some tokenizers (e.g., Roberta-Base), can include leading whitespace in decoded entity
+
+            # encode/decode annotated entity and assert equality
+            expected_entity = tokenizer.decode(tokenizer.encode(annotated_entity, add_special_tokens=False))
         result = expected_entity == recovered_entity if strict else expected_entity in recovered_entity
         assert result, f"Recovered entity (via IOB labels) '{recovered_entity}' does not match expected entity '{annotated_entity}'. Decoded form is '{expected_entity}'."
 
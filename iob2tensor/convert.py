@@ -1,16 +1,97 @@
+from itertools import chain
+from typing import TYPE_CHECKING
+
+import numpy as np
 import torch
-from transformers import PreTrainedTokenizer
 
-from iob2tensor.labels import LabelMap, IobPrefixes, format_entity_label
+from iob2tensor.labels import LabelMap, IobPrefixes, create_entity_pair_map
 from iob2tensor.labels import DEFAULT_TAG_LABEL, IGNORE_TOKEN
 from iob2tensor.annotations import Annotation, DefaultFields
 from iob2tensor.checker import check_iob_conversion
 
+if TYPE_CHECKING: # <- only needed for annotations; avoids importing transformers with the package
+    from transformers import PreTrainedTokenizer
+
+
+## -- fast tokenizers report per-token character offsets, so character -> token
+## -- lookups can be done as a binary search over token offsets rather than
+## -- a `char_to_token` call per entity boundary.
+
+def _token_offsets(offset_mapping: list[tuple[int, int]], special_tokens_mask: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Token indices, and character start and end offsets, of the (non-special) tokens covering the text."""
+    offsets = np.asarray(offset_mapping, dtype=np.int64).reshape(-1, 2)
+    token_idx = np.flatnonzero(~np.asarray(special_tokens_mask, dtype=bool))
+    return token_idx, offsets[token_idx, 0], offsets[token_idx, 1]
+
+def _entity_token_indices(
+    token_idx: np.ndarray,
+    token_char_starts: np.ndarray,
+    token_char_ends: np.ndarray,
+    entity_chars_start: list[int],
+    entity_chars_end: list[int],
+    entities: list[dict]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Token indices of the tokens containing the first and last character of each entity. As with `char_to_token`,
+    a boundary character which no token covers (e.g., whitespace, or text lost to truncation) is an error."""
+    chars_start = np.asarray(entity_chars_start, dtype=np.int64)
+    chars_end = np.asarray(entity_chars_end, dtype=np.int64)
+    first = np.searchsorted(token_char_ends, chars_start, side="right") # <- first token ending after the character
+    last = np.searchsorted(token_char_starts, chars_end, side="right") - 1 # <- last token starting at or before it
+    if token_idx.size:
+        first_clipped, last_clipped = np.minimum(first, token_idx.size - 1), np.maximum(last, 0)
+        covered = (first < token_idx.size) & (token_char_starts[first_clipped] <= chars_start)
+        covered &= (last >= 0) & (chars_end < token_char_ends[last_clipped])
+    else:
+        covered = np.zeros(len(entities), dtype=bool)
+    uncovered = np.flatnonzero(~covered)
+    assert uncovered.size == 0, f"Entity {entities[uncovered[0]]} starts or ends on a character which is not covered by a token (e.g., whitespace), or lies beyond the encoded (possibly truncated) text."
+    return token_idx[first], token_idx[last]
+
+def _initial_labels(input_ids: list[int], special_ids: np.ndarray, ignore_token: int, outside: int) -> np.ndarray:
+    """Fill every token with the 'outside' label, except special tokens which get the ignore token."""
+    return np.where(np.isin(np.asarray(input_ids, dtype=np.int64), special_ids), ignore_token, outside).astype(np.int64)
+
+def _entity_label_ids(entities: list[dict], entity_pairs: dict[str, tuple[int, int]]) -> tuple[np.ndarray, np.ndarray]:
+    """Beginning and inside label values for each entity."""
+    label_field = DefaultFields.LABEL
+    pairs = np.asarray([entity_pairs[entity[label_field].upper()] for entity in entities], dtype=np.int64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+def _assign_entity_labels(
+    target_labels: np.ndarray,
+    token_starts: np.ndarray,
+    token_stops: np.ndarray,
+    b_ids: np.ndarray,
+    i_ids: np.ndarray
+) -> None:
+    """Overwrite 'outside' labels with beginning + inside labels for each entity (in-place), without a python
+    loop over entities."""
+    # inside runs cover tokens (start, stop] of each entity; expand them into flat indices
+    run_lengths = token_stops - token_starts
+    run_offsets = np.repeat(np.cumsum(run_lengths) - run_lengths, run_lengths)
+    inside_indices = np.repeat(token_starts + 1, run_lengths) + np.arange(run_lengths.sum()) - run_offsets
+
+    target_labels[inside_indices] = np.repeat(i_ids, run_lengths)
+    target_labels[token_starts] = b_ids
+
+def _check_fast_tokenizer(tokenizer: "PreTrainedTokenizer") -> None:
+    """Conversion relies on token character offsets, which only fast (Rust-backed) tokenizers provide."""
+    assert getattr(tokenizer, "is_fast", False), f"A fast tokenizer is required (e.g., `AutoTokenizer.from_pretrained(checkpoint, use_fast=True)`). Got '{type(tokenizer).__name__}'."
+
+def _unique_with_inverse(texts: list[str]) -> tuple[list[str], list[int]]:
+    """Unique texts (in first-seen order) and, for each input text, the index of its unique entry."""
+    unique_idx, unique, inverse = {}, [], []
+    for text in texts:
+        if text not in unique_idx:
+            unique_idx[text] = len(unique)
+            unique.append(text)
+        inverse.append(unique_idx[text])
+    return unique, inverse
 
 def to_iob_tensor(
     annotation: Annotation,
     label_map: LabelMap,
-    tokenizer: PreTrainedTokenizer,
+    tokenizer: "PreTrainedTokenizer",
     ignore_token: int = IGNORE_TOKEN,
     ends_at_next_char: bool = True,
     conversion_check: bool = True,
@@ -19,27 +100,36 @@ def to_iob_tensor(
     """Create target tensor from NER span annotations following IOB format. The process requires use of the
     original annotation spans and text, encoded representation of the text, and features from the Huggingface
     Tokenizer. As a result, a few things happen in this function and a dictionary of outputs are returned."""
-    encoded = tokenizer(annotation[DefaultFields.TEXT], truncation=True)
-
-    target_labels = [
-        ignore_token if input_id in tokenizer.all_special_ids else label_map[IobPrefixes.OUTSIDE]
-        for input_id in encoded["input_ids"]
-    ]
-
-    for entity in annotation[DefaultFields.SPANS]:
-        token_start = encoded.char_to_token(entity[DefaultFields.START])
-        token_end = encoded.char_to_token(entity[DefaultFields.END] - 1 if ends_at_next_char else entity[DefaultFields.END])
-
-        # get entity label values (beginning + inside)
-        b_ent = label_map[format_entity_label(IobPrefixes.BEGINNING, entity[DefaultFields.LABEL])]
-        i_ent = label_map[format_entity_label(IobPrefixes.INSIDE, entity[DefaultFields.LABEL])]
-
-        # replace filled 'outside' label with entity labels
-        target_labels = (
-            target_labels[:token_start] +
-            [b_ent] + [i_ent] * (token_end - token_start) +
-            target_labels[(token_end + 1):]
-        )
+    _check_fast_tokenizer(tokenizer)
+    encoded = tokenizer(
+        annotation[DefaultFields.TEXT],
+        truncation=True,
+        return_offsets_mapping=True,
+        return_special_tokens_mask=True
+    )
+
+    special_ids = np.asarray(tokenizer.all_special_ids, dtype=np.int64)
+    target_labels = _initial_labels(encoded["input_ids"], special_ids, ignore_token, label_map[IobPrefixes.OUTSIDE])
+
+    # resolve (beginning, inside) label values once, rather than per entity
+    entity_pairs = create_entity_pair_map(label_map)
+
+    # locate token indices for all entity boundaries at once
+    token_idx, token_char_starts, token_char_ends = _token_offsets(encoded["offset_mapping"], encoded["special_tokens_mask"])
+    entities = annotation[DefaultFields.SPANS]
+    end_adj = int(ends_at_next_char) # <- last character of entity is one before `end` if it points at the next char
+    token_starts, token_stops = _entity_token_indices(
+        token_idx,
+        token_char_starts,
+        token_char_ends,
+        [entity[DefaultFields.START] for entity in entities],
+        [entity[DefaultFields.END] - end_adj for entity in entities],
+        entities
+    )
+
+    # replace filled 'outside' label with entity labels
+    b_ids, i_ids = _entity_label_ids(entities, entity_pairs)
+    _assign_entity_labels(target_labels, token_starts, token_stops, b_ids, i_ids)
 
     # test that final labels is same shape as input ids
     if conversion_check:
@@ -48,8 +138,109 @@ def to_iob_tensor(
             label_map,
             tokenizer,
             encoded["input_ids"],
-            annotation
+            annotation,
+            offsets=encoded["offset_mapping"]
         )
     if return_as_list is False:
-        target_labels = torch.tensor(target_labels)
-    return target_labels
+        # zero-copy; the label array is not referenced anywhere else
+        return torch.from_numpy(target_labels)
+    return target_labels.tolist()
+
+def to_iob_tensor_batch(
+    annotations: list[Annotation],
+    label_map: LabelMap,
+    tokenizer: "PreTrainedTokenizer",
+    ignore_token: int = IGNORE_TOKEN,
+    ends_at_next_char: bool = True,
+    conversion_check: bool | int = False,
+    return_as_list: bool = False,
+    dedup: bool = False
+) -> list[torch.Tensor] | list[list[int]]:
+    """Create target tensors for a batch of NER span annotations following IOB format. Texts are encoded with a
+    single (multithreaded, see `TOKENIZERS_PARALLELISM`) tokenizer call, and entity boundaries across the whole
+    batch are located with one search over the concatenated token offsets. Returns one (variable-length) output
+    per annotation, in input order. Output tensors are views into a single buffer allocated for the batch.
+
+    The conversion check is as costly as the conversion itself, so it is off by default for batches. Pass `True`
+    to check every annotation, or an integer `k` to check every k-th annotation (sampled). Set `dedup=True` to
+    only encode each distinct text once (e.g., for augmented datasets with repeated texts)."""
+    _check_fast_tokenizer(tokenizer)
+    if not annotations:
+        return []
+    if not isinstance(conversion_check, int): # <- bool is a subclass of int
+        raise TypeError(f"Conversion check must be a bool or an integer interval. Got type '{type(conversion_check).__name__}'.")
+    if conversion_check < 0:
+        raise ValueError(f"Conversion check interval must be non-negative. Got {conversion_check}.")
+    check_every = int(conversion_check) # <- True checks every annotation, False (0) none
+    texts = [annotation[DefaultFields.TEXT] for annotation in annotations]
+    unique_texts, inverse = _unique_with_inverse(texts) if dedup else (texts, None)
+    encoded = tokenizer(
+        unique_texts,
+        truncation=True,
+        return_offsets_mapping=True,
+        return_special_tokens_mask=True
+    )
+    batch_input_ids, offset_mappings, special_tokens_masks = (
+        encoded["input_ids"], encoded["offset_mapping"], encoded["special_tokens_mask"]
+    )
+    if inverse is not None:
+        # map encodings of unique texts back onto the (possibly repeated) input order
+        batch_input_ids = [batch_input_ids[idx] for idx in inverse]
+        offset_mappings = [offset_mappings[idx] for idx in inverse]
+        special_tokens_masks = [special_tokens_masks[idx] for idx in inverse]
+    entity_pairs = create_entity_pair_map(label_map)
+    special_ids = np.asarray(tokenizer.all_special_ids, dtype=np.int64)
+    outside = label_map[IobPrefixes.OUTSIDE]
+
+    # concatenate per-annotation token offsets into flat, non-decreasing arrays by shifting each annotation
+    # past the previous text's length, tracking where each annotation's tokens begin (CSR-style)
+    flat_token_idx, flat_token_starts, flat_token_ends, token_ptr = [], [], [], [0]
+    entities, entity_chars_start, entity_chars_end = [], [], []
+    # bind loop invariants to locals
+    text_field, spans_field = DefaultFields.TEXT, DefaultFields.SPANS
+    start_field, end_field = DefaultFields.START, DefaultFields.END
+    end_adj = int(ends_at_next_char)
+    char_base = 0
+    for ann_idx, annotation in enumerate(annotations):
+        token_idx, token_char_starts, token_char_ends = _token_offsets(offset_mappings[ann_idx], special_tokens_masks[ann_idx])
+        flat_token_idx.append(token_idx + token_ptr[-1])
+        flat_token_starts.append(token_char_starts + char_base)
+        flat_token_ends.append(token_char_ends + char_base)
+        token_ptr.append(token_ptr[-1] + len(offset_mappings[ann_idx]))
+        for entity in annotation[spans_field]:
+            entities.append(entity)
+            entity_chars_start.append(entity[start_field] + char_base)
+            entity_chars_end.append(entity[end_field] - end_adj + char_base)
+        char_base += len(annotation[text_field]) + 1
+
+    # one search per boundary side across the whole batch, giving token indices into the flat (batch) labels.
+    # texts are separated by an uncovered character, so a covering token always belongs to the entity's own annotation
+    token_starts, token_stops = _entity_token_indices(
+        np.concatenate(flat_token_idx),
+        np.concatenate(flat_token_starts),
+        np.concatenate(flat_token_ends),
+        entity_chars_start,
+        entity_chars_end,
+        entities
+    )
+
+    # preallocate labels for the whole batch in one buffer, and assign all entity labels at once
+    flat_input_ids = np.fromiter(chain.from_iterable(batch_input_ids), dtype=np.int64, count=token_ptr[-1])
+    flat_labels = _initial_labels(flat_input_ids, special_ids, ignore_token, outside)
+    b_ids, i_ids = _entity_label_ids(entities, entity_pairs)
+    _assign_entity_labels(flat_labels, token_starts, token_stops, b_ids, i_ids)
+
+    if check_every:
+        for ann_idx in range(0, len(annotations), check_every):
+            check_iob_conversion(
+                flat_labels[token_ptr[ann_idx]:token_ptr[ann_idx + 1]],
+                label_map,
+                tokenizer,
+                batch_input_ids[ann_idx],
+                annotations[ann_idx],
+                offsets=offset_mappings[ann_idx]
+            )
+
+    if return_as_list:
+        return [flat_labels[token_ptr[idx]:token_ptr[idx + 1]].tolist() for idx in range(len(annotations))]
+    return list(torch.from_numpy(flat_labels).split(np.diff(token_ptr).tolist()))
@@ -1,4 +1,6 @@
-from typing import Literal
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Literal, Mapping
 
 
 IGNORE_TOKEN = -100 # <- pytorch-specific
@@ -24,23 +26,39 @@ def format_entity_label(prefix: Literal["I", "B"], label: str = DEFAULT_TAG_LABE
 ## -- to support NER training. Additionally, the function takes an optional
 ## -- list of arbitrary labels (must be strings, must be unique) and dynamically
 ## -- creates this dictionary by incrementing the index values accordingly.
+## -- Label maps are memoized per (ordered) tuple of labels.
 
 Tag = str
 Label  = int
 LabelMap = dict[Tag, Label]
+EntityPairMap = dict[str, tuple[Label, Label]]
 
-def create_label_map(labels: list[str] | None = None) -> LabelMap:
-    """Construct NER-IOB label index mapping with input list of labels."""
+@lru_cache(maxsize=64)
+def _create_label_map_cached(labels: tuple[str, ...]) -> Mapping[Tag, Label]:
+    # tags are formatted inline (rather than via `format_entity_label`) as prefixes are known to be valid
+    label_map = {IobPrefixes.OUTSIDE: 0}
+    for i, label in enumerate(labels):
+        label = label.upper()
+        label_map[f"{IobPrefixes.BEGINNING}-{label}"] = 2 * i + 1 # e.g., "B-ORG: 2"
+        label_map[f"{IobPrefixes.INSIDE}-{label}"] = 2 * i + 2    # e.g., "I-ORG: 3"
+    return MappingProxyType(label_map)
+
+def create_label_map(labels: list[str] | None = None, read_only: bool = False) -> LabelMap | Mapping[Tag, Label]:
+    """Construct NER-IOB label index mapping with input list of labels. With `read_only`, the shared (cached)
+    mapping is returned as a read-only view instead of a fresh dict copy."""
     if labels is None:
         labels = [DEFAULT_TAG_LABEL]
+    assert all(isinstance(_lbl, str) for _lbl in labels), f"Input labels must contain only strings. Other type(s) detected."
     assert len(labels) == len(set(labels)), f"Input labels contains duplicate values. Labels must be unique."
-    assert all([isinstance(_lbl, str) for _lbl in labels]), f"Input labels must contain only strings. Other type(s) detected."
+    # label maps are cached per (ordered) labels; return a copy so callers can safely mutate it
+    label_map = _create_label_map_cached(tuple(labels))
+    return label_map if read_only else dict(label_map)
 
-    label_map = {IobPrefixes.OUTSIDE: 0}
-    for i in range(0, len(labels) * 2, 2):
-        label = labels[i // 2].upper()
-        label_map.update({
-            format_entity_label(prefix=IobPrefixes.BEGINNING, label=label): (i + 1), # e.g., "B-ORG: 2"
-            format_entity_label(prefix=IobPrefixes.INSIDE, label=label): (i + 2)     # e.g., "I-ORG: 3"
-        })
-    return label_map
+def create_entity_pair_map(label_map: Mapping[Tag, Label]) -> EntityPairMap:
+    """Construct entity label -> (beginning, inside) index mapping from an IOB label map."""
+    entity_pairs = {}
+    for tag, idx in label_map.items():
+        if tag.startswith(f"{IobPrefixes.BEGINNING}-"):
+            label = tag[2:]
+            entity_pairs[label] = (idx, label_map[format_entity_label(prefix=IobPrefixes.INSIDE, label=label)]) # e.g., "ORG: (2, 3)"
+    return entity_pairs
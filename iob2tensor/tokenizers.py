@@ -2,7 +2,7 @@
 # other checkpoints not specified here could
 # likely be used as well. See `tests/test_tokenizers.py`.
 
-SUPPORTED_TOKENIZERS = [
+SUPPORTED_TOKENIZERS = frozenset({
     "bert-base-cased",
     "bert-base-uncased",
     "bert-large-cased",
@@ -11,4 +11,7 @@ SUPPORTED_TOKENIZERS = [
     "distilbert-base-uncased",
     "roberta-base",
     "roberta-large"
-]
+})
+
+# ordered view of the above, for listing and iteration
+SUPPORTED_TOKENIZERS_LIST = tuple(sorted(SUPPORTED_TOKENIZERS))
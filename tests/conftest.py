@@ -0,0 +1,102 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from iob2tensor import create_label_map
+
+# checkpoint used by tests which are not parametrized over tokenizers
+DEFAULT_TOKENIZER_CHECKPOINT = "bert-base-uncased"
+
+# entity labels shared by the example (MITMovie) annotations across tests
+LABELS = ["actor", "character", "plot"]
+MY_CUSTOM_LABELS = ["ARBITRARY_LABEL"]
+
+## -- the larger checkpoints are the slowest to load, so schedule their
+## -- test groups first to keep them from landing last on a single worker.
+
+def _is_large_checkpoint(item) -> bool:
+    marker = item.get_closest_marker("xdist_group")
+    return marker is not None and "large" in marker.kwargs.get("name", "")
+
+def pytest_collection_modifyitems(config, items):
+    items.sort(key=lambda item: not _is_large_checkpoint(item)) # <- stable sort, otherwise keeps collection order
+
+
+## -- label maps are identical across tests, so build them once per session.
+
+@pytest.fixture(scope="session")
+def label_map():
+    return create_label_map(LABELS)
+
+@pytest.fixture(scope="session")
+def custom_label_map():
+    return create_label_map(MY_CUSTOM_LABELS)
+
+## -- tokenizers are loaded once per checkpoint per session (i.e., per xdist
+## -- worker) and shared across tests. Parametrize `tokenizer` indirectly with
+## -- a checkpoint name, otherwise the default checkpoint is used.
+
+def _collected_checkpoints(items) -> list[str]:
+    """Tokenizer checkpoints used by the collected (i.e., selected) tests."""
+    checkpoints = set()
+    for item in items:
+        if "tokenizer" in getattr(item, "fixturenames", ()):
+            callspec = getattr(item, "callspec", None)
+            checkpoints.add(callspec.params.get("tokenizer", DEFAULT_TOKENIZER_CHECKPOINT) if callspec else DEFAULT_TOKENIZER_CHECKPOINT)
+    return sorted(checkpoints)
+
+@pytest.fixture(scope="session")
+def prefetch_tokenizers(request, tmp_path_factory) -> None:
+    """Download tokenizer files for the checkpoints used by the selected tests concurrently (into the regular HF hub
+    cache), rather than one-by-one on first use. Runs once per test run, i.e., by the first xdist worker to get here."""
+    huggingface_hub = pytest.importorskip("huggingface_hub")
+    if os.environ.get("HF_HUB_OFFLINE"):
+        return
+    from filelock import FileLock # <- dependency of huggingface_hub
+
+    def _download(checkpoint: str) -> None:
+        try:
+            huggingface_hub.snapshot_download(checkpoint, allow_patterns=["*.json", "*.txt"])
+        except Exception as error:
+            warnings.warn(f"Could not prefetch tokenizer files for '{checkpoint}' ({error}). Falling back to download on load.")
+
+    # workers share the parent of their base temp directories, so a marker there records a completed prefetch
+    shared_dir = tmp_path_factory.getbasetemp().parent if os.environ.get("PYTEST_XDIST_WORKER") else tmp_path_factory.getbasetemp()
+    marker = shared_dir / "tokenizers_prefetched"
+    with FileLock(str(marker) + ".lock"):
+        if marker.exists():
+            return
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(_download, _collected_checkpoints(request.session.items)))
+        marker.touch()
+
+@pytest.fixture(scope="session")
+def tokenizer_cache() -> dict:
+    return {}
+
+@pytest.fixture
+def tokenizer(request, tokenizer_cache, prefetch_tokenizers):
+    # imported lazily (transformers is heavy), skipping tokenizer tests where it is unavailable
+    transformers = pytest.importorskip("transformers")
+    checkpoint = getattr(request, "param", DEFAULT_TOKENIZER_CHECKPOINT)
+    if checkpoint not in tokenizer_cache:
+        tokenizer_cache[checkpoint] = transformers.AutoTokenizer.from_pretrained(checkpoint, use_fast=True)
+    return tokenizer_cache[checkpoint]
+
+## -- encodings of (invariant) test texts are also cached per session, keyed
+## -- by checkpoint and text, for tests which only need the encoded inputs.
+
+@pytest.fixture(scope="session")
+def encoding_cache() -> dict:
+    return {}
+
+@pytest.fixture
+def get_encoding(tokenizer, encoding_cache):
+    def _get_encoding(text: str):
+        key = (tokenizer.name_or_path, text)
+        if key not in encoding_cache:
+            encoding_cache[key] = tokenizer(text, truncation=True)
+        return encoding_cache[key]
+    return _get_encoding
@@ -0,0 +1,94 @@
+import pytest
+import torch
+
+from iob2tensor import preprocessing, to_iob_tensor, to_iob_tensor_batch
+
+ANNOTATIONS = [
+    {
+        "text": "Did Dame Judy Dench star in a British film about Queen Elizabeth?",
+        "spans": [
+            {"label": "actor", "start": 4, "end": 19},
+            {"label": "plot", "start": 30, "end": 37},
+            {"label": "character", "start": 49, "end": 64}
+        ]
+    },
+    {
+        "text": "How many times has Matt Damon been Jason Bourne?",
+        "spans": [
+            {"label": "actor", "start": 19, "end": 29},
+            {"label": "character", "start": 35, "end": 47}
+        ]
+    },
+    {
+        "text": "What movies came out last weekend?",
+        "spans": []
+    }
+]
+
+# annotations are invariant, so preprocess them once at import
+PREPROCESSED = [preprocessing(**ann) for ann in ANNOTATIONS]
+
+@pytest.mark.parametrize("batch_size", [2, 8, 64])
+def test_batch_matches_single_conversion(batch_size, label_map, tokenizer):
+    # cycle through the example annotations to fill the batch
+    annotations = [PREPROCESSED[idx % len(PREPROCESSED)] for idx in range(batch_size)]
+    single_labels = [to_iob_tensor(annotation, label_map, tokenizer) for annotation in PREPROCESSED]
+
+    batch_labels = to_iob_tensor_batch(annotations, label_map, tokenizer)
+    assert len(batch_labels) == len(annotations), f"Expected {len(annotations)} outputs, but got {len(batch_labels)}."
+
+    for idx, iob_labels in enumerate(batch_labels):
+        expected = single_labels[idx % len(PREPROCESSED)]
+        assert torch.equal(iob_labels, expected), f"Batch conversion returned {iob_labels}, but single conversion returned {expected}."
+
+    # list outputs are sliced from the same batch labels
+    batch_lists = to_iob_tensor_batch(annotations, label_map, tokenizer, return_as_list=True)
+    assert batch_lists == [iob_labels.tolist() for iob_labels in batch_labels], f"Batch conversion (as lists) returned {batch_lists}, but expected {batch_labels}."
+
+def test_batch_dedup_matches_batch(label_map, tokenizer):
+    # repeat texts (with differing spans) to exercise mapping encodings back onto input order
+    annotations = PREPROCESSED + PREPROCESSED[:2]
+    annotations.append(preprocessing(ANNOTATIONS[0]["text"], []))
+
+    expected = to_iob_tensor_batch(annotations, label_map, tokenizer)
+    deduped = to_iob_tensor_batch(annotations, label_map, tokenizer, dedup=True)
+    assert len(deduped) == len(expected), f"Expected {len(expected)} outputs, but got {len(deduped)}."
+    assert all(torch.equal(a, b) for a, b in zip(deduped, expected)), f"Deduplicated batch conversion returned {deduped}, but expected {expected}."
+
+def test_entity_ending_on_whitespace_fails(label_map, tokenizer):
+    # trailing whitespace is not covered by any token, so it must not resolve to the following token ('been')
+    annotation = preprocessing(ANNOTATIONS[1]["text"], [{"label": "actor", "start": 19, "end": 30}])
+    with pytest.raises(AssertionError, match=r"not covered by a token"):
+        to_iob_tensor(annotation, label_map, tokenizer, conversion_check=False)
+    with pytest.raises(AssertionError, match=r"not covered by a token"):
+        to_iob_tensor_batch([PREPROCESSED[0], annotation], label_map, tokenizer)
+
+@pytest.mark.parametrize("conversion_check,expected_checked", [
+    (False, []),
+    (0, []),
+    (True, list(range(7))),
+    (1, list(range(7))),
+    (3, [0, 3, 6])
+])
+def test_batch_conversion_check_sampling(conversion_check, expected_checked, label_map, tokenizer, monkeypatch):
+    # distinct (equal) annotation objects, so checked annotations can be identified by position
+    annotations = [preprocessing(**ANNOTATIONS[idx % len(ANNOTATIONS)]) for idx in range(7)]
+    checked = []
+    monkeypatch.setattr(
+        "iob2tensor.convert.check_iob_conversion",
+        lambda *args, **kwargs: checked.append(next(idx for idx, ann in enumerate(annotations) if ann is args[4]))
+    )
+    batch_labels = to_iob_tensor_batch(annotations, label_map, tokenizer, conversion_check=conversion_check)
+    assert checked == expected_checked, f"Expected annotations {expected_checked} to be checked, but checked {checked}."
+    assert len(batch_labels) == len(annotations), f"Expected {len(annotations)} outputs, but got {len(batch_labels)}."
+
+def test_batch_conversion_check_default_and_invalid(label_map, tokenizer, monkeypatch):
+    checked = []
+    monkeypatch.setattr("iob2tensor.convert.check_iob_conversion", lambda *args, **kwargs: checked.append(args))
+    to_iob_tensor_batch(PREPROCESSED, label_map, tokenizer)
+    assert checked == [], f"Expected no conversion checks by default, but got {len(checked)}."
+    with pytest.raises(ValueError, match=r"must be non-negative"):
+        to_iob_tensor_batch(PREPROCESSED, label_map, tokenizer, conversion_check=-1)
+    for conversion_check in (2.7, "3", None):
+        with pytest.raises(TypeError):
+            to_iob_tensor_batch(PREPROCESSED, label_map, tokenizer, conversion_check=conversion_check)
@@ -1,16 +1,9 @@
 import pytest
 
-from transformers import AutoTokenizer
-
-from iob2tensor import create_label_map
 from iob2tensor.annotations import preprocessing, DefaultFields
 from iob2tensor.checker import check_iob_conversion
 
 ## -- set constants and configurations
-TOKENIZER_CHECKPOINT = "bert-base-uncased"
-
-LABELS = ["actor", "character", "plot"]
-
 TEST_CASES = [
     {
         "annotation": {
@@ -37,31 +30,39 @@ TEST_CASES = [
     }
 ]
 
-def test_conversion_checker():
-    label_map = create_label_map(LABELS)
-    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_CHECKPOINT)
+# annotations are invariant, so preprocess them once at import
+PREPROCESSED = [preprocessing(**case["annotation"]) for case in TEST_CASES]
+
+@pytest.mark.parametrize(
+    "case,annotation",
+    list(zip(TEST_CASES, PREPROCESSED)),
+    ids=[case["annotation"]["text"][:20] for case in TEST_CASES]
+)
+def test_conversion_checker(case, annotation, label_map, tokenizer, get_encoding):
 
-    for _case in TEST_CASES:
-        annotation = _case["annotation"]
-        annotation = preprocessing(**annotation)
+    encoded = get_encoding(annotation[DefaultFields.TEXT])
 
-        encoded = tokenizer(annotation[DefaultFields.TEXT], truncation=True)
+    # happy path... correct conversion
+    check_iob_conversion(
+        case["correct_iob_labels"],
+        label_map,
+        tokenizer,
+        encoded["input_ids"],
+        annotation
+    )
 
-        # happy path... correct conversion
+    # bad path... incorrect conversion
+    with pytest.raises(AssertionError) as expected_error:
         check_iob_conversion(
-            _case["correct_iob_labels"],
+            case["incorrect_iob_labels"],
             label_map,
             tokenizer,
             encoded["input_ids"],
             annotation
         )
 
-        # bad path... incorrect conversion
-        with pytest.raises(AssertionError) as expected_error:
-            check_iob_conversion(
-                _case["incorrect_iob_labels"],
-                label_map,
-                tokenizer,
-                encoded["input_ids"],
-                annotation
-            )
+def test_conversion_checker_swapped_labels(label_map):
+    # entity boundaries are correct but labels are swapped, so fails before any text (i.e., tokenizer) checks
+    swapped_labels = [-100, 0, 0, 0, 0, 3, 4, 0, 1, 2, 0, -100]
+    with pytest.raises(AssertionError, match=r"Entity labels .* do not match"):
+        check_iob_conversion(swapped_labels, label_map, None, None, PREPROCESSED[1])
@@ -1,4 +1,6 @@
-from iob2tensor import create_label_map
+import pytest
+
+from iob2tensor import create_label_map, create_entity_pair_map
 
 TEST_LABELS = ["character", "actor", "plot"]
 
@@ -18,6 +20,12 @@ TEST_TARGET_WITH_NO_LABELS = {
     "I-LABEL": 2
 }
 
+TEST_TARGET_ENTITY_PAIRS = {
+    "CHARACTER": (1, 2),
+    "ACTOR": (3, 4),
+    "PLOT": (5, 6)
+}
+
 
 def test_construct_label_index_with_labels():
     label_index = create_label_map(TEST_LABELS)
@@ -26,3 +34,17 @@ def test_construct_label_index_with_labels():
 def test_construct_label_index_without_labels():
     label_index = create_label_map()
     assert label_index == TEST_TARGET_WITH_NO_LABELS, f"Created label index (with no labels) does not match target. Instead, got: {label_index}."
+
+def test_construct_entity_pair_map():
+    entity_pairs = create_entity_pair_map(create_label_map(TEST_LABELS))
+    assert entity_pairs == TEST_TARGET_ENTITY_PAIRS, f"Created entity pair map does not match target. Instead, got: {entity_pairs}."
+
+def test_construct_read_only_label_index():
+    label_index = create_label_map(TEST_LABELS, read_only=True)
+    assert label_index == TEST_TARGET_WITH_LABELS, f"Created read-only label index does not match target. Instead, got: {label_index}."
+    with pytest.raises(TypeError):
+        label_index["B-NEW"] = 7
+    # mutable copies are unaffected by (and do not affect) the shared read-only map
+    label_copy = create_label_map(TEST_LABELS)
+    label_copy["B-NEW"] = 7
+    assert "B-NEW" not in create_label_map(TEST_LABELS, read_only=True)
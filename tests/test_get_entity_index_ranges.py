@@ -1,7 +1,7 @@
-from iob2tensor.labels import IGNORE_TOKEN, create_label_map
-from iob2tensor.checker import get_entity_index_ranges
+import pytest
 
-MY_CUSTOM_LABELS = ["ARBITRARY_LABEL"]
+from iob2tensor.labels import IGNORE_TOKEN
+from iob2tensor.checker import get_entity_index_ranges, VECTORIZE_MIN_LENGTH
 
 test_cases = {
     "no_entities": {
@@ -23,13 +23,21 @@ test_cases = {
     "multi_entities_consecutive": {
         "example": [IGNORE_TOKEN, 0, 0, 0, 1, 2, 2, 2, 1, 2, 2, 2, 2, 0, 0, IGNORE_TOKEN],
         "target": [(4, 7), (8, 12)]
+    },
+    "multi_entities_long_sequence": { # <- long enough to use the vectorized path
+        "example": [IGNORE_TOKEN] + [0] * 20 + [1, 2, 2] + [0] * 10 + [1, 1, 2] + [0] * 5 + [1] + [0] * VECTORIZE_MIN_LENGTH + [IGNORE_TOKEN],
+        "target": [(21, 23), (34, 34), (35, 36), (42, 42)]
     }
 }
 
-def test_get_entity_index_ranges():
-    label_map = create_label_map(labels=MY_CUSTOM_LABELS)
+@pytest.mark.parametrize("name,case", list(test_cases.items()), ids=list(test_cases))
+def test_get_entity_index_ranges(name, case, custom_label_map):
+    matched_range = get_entity_index_ranges(custom_label_map, case["example"])
+    assert matched_range == case["target"], f"Range matching failed for case '{name}'. Returned {matched_range}, but expected {case['target']}."
 
-    # range match function tests...
-    for _name, _case in test_cases.items():
-        matched_range = get_entity_index_ranges(label_map, _case["example"])
-        assert matched_range == _case["target"], f"Range matching failed for case '{_name}'. Returned {matched_range}, but expected {_case['target']}."
+@pytest.mark.parametrize("length", [16, VECTORIZE_MIN_LENGTH], ids=["scan", "vectorized"])
+def test_get_entity_index_ranges_unknown_label(length, custom_label_map):
+    # label values missing from the label map are an error, whichever path is used
+    example = [IGNORE_TOKEN, 1, 2] + [0] * (length - 5) + [7, IGNORE_TOKEN]
+    with pytest.raises(KeyError):
+        get_entity_index_ranges(custom_label_map, example)
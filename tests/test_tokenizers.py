@@ -1,9 +1,8 @@
-from transformers import AutoTokenizer
+import pytest
+import torch
 
-from iob2tensor import preprocessing, create_label_map, to_iob_tensor
-from iob2tensor.tokenizers import SUPPORTED_TOKENIZERS
-
-labels = ["actor", "character", "plot"]
+from iob2tensor import preprocessing, to_iob_tensor, to_iob_tensor_batch
+from iob2tensor.tokenizers import SUPPORTED_TOKENIZERS_LIST
 
 example_annotation = {
     "text": "Did Dame Judy Dench star in a British film about Queen Elizabeth?",
@@ -14,25 +13,73 @@ example_annotation = {
     ]
 }
 
-def test_tokenizer_compatability():
-
-    for checkpoint in SUPPORTED_TOKENIZERS:
+# additional annotations (incl. repeated entity labels and no entities) for the batched check
+batch_annotations = [
+    example_annotation,
+    {
+        "text": "How many times has Matt Damon been Jason Bourne?",
+        "spans": [
+            {"label": "actor", "start": 19, "end": 29},
+            {"label": "character", "start": 35, "end": 47}
+        ]
+    },
+    {
+        "text": "Were Tom Hanks and Meg Ryan in a romantic comedy together?",
+        "spans": [
+            {"label": "actor", "start": 5, "end": 14},
+            {"label": "actor", "start": 19, "end": 27},
+            {"label": "plot", "start": 33, "end": 48}
+        ]
+    },
+    {
+        "text": "What movies came out last weekend?",
+        "spans": []
+    }
+]
 
-        try:
-            # -- initialize tokenizer ----
-            tokenizer = AutoTokenizer.from_pretrained(checkpoint)
+# preprocess once; the validated annotations are shared across all checkpoints
+validated_annotation = preprocessing(**example_annotation)
+validated_batch = [preprocessing(**annotation) for annotation in batch_annotations]
 
-            validated_annotation = preprocessing(**example_annotation)
+# one xdist group per checkpoint, so each worker loads a given tokenizer once
+CHECKPOINT_PARAMS = [
+    pytest.param(checkpoint, marks=pytest.mark.xdist_group(name=checkpoint)) for checkpoint in SUPPORTED_TOKENIZERS_LIST
+]
 
-            # -- create label index/map ----
-            label_map = create_label_map(labels)
+@pytest.mark.parametrize(
+    "tokenizer",
+    CHECKPOINT_PARAMS,
+    indirect=True
+)
+def test_tokenizer_compatability(label_map, tokenizer):
+    try:
+        # -- convert annotation to iob tensor format ----
+        iob_tensor = to_iob_tensor(
+            validated_annotation,
+            label_map,
+            tokenizer,
+            conversion_check=True
+        )
+    except Exception as error:
+        raise Exception(f"Compatability error for tokenizer checkpoint {tokenizer.name_or_path}. Encountered the following error:\n{error}.")
 
-            # -- convert annotation to iob tensor format ----
-            iob_tensor = to_iob_tensor(
-                validated_annotation,
-                label_map,
-                tokenizer,
-                conversion_check=True
-            )
-        except Exception as error:
-            raise Exception(f"Compatability error for tokenizer checkpoint {checkpoint}. Encountered the following error:\n{error}.")
+# all annotations converted (and checked) with one batch call per checkpoint
+@pytest.mark.parametrize(
+    "tokenizer",
+    CHECKPOINT_PARAMS,
+    indirect=True
+)
+def test_tokenizer_compatability_batched(label_map, tokenizer):
+    try:
+        iob_tensors = to_iob_tensor_batch(
+            validated_batch,
+            label_map,
+            tokenizer,
+            conversion_check=True
+        )
+    except Exception as error:
+        raise Exception(f"Batched compatability error for tokenizer checkpoint {tokenizer.name_or_path}. Encountered the following error:\n{error}.")
+    assert len(iob_tensors) == len(validated_batch), f"Expected {len(validated_batch)} outputs, but got {len(iob_tensors)}."
+    for annotation, iob_tensor in zip(validated_batch, iob_tensors):
+        expected = to_iob_tensor(annotation, label_map, tokenizer, conversion_check=False)
+        assert torch.equal(iob_tensor, expected), f"Batch conversion returned {iob_tensor}, but single conversion returned {expected} for tokenizer checkpoint {tokenizer.name_or_path}."
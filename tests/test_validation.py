@@ -0,0 +1,80 @@
+import pytest
+
+from iob2tensor.annotations import preprocessing, validate_batch
+
+TEXT = "How many times has Matt Damon been Jason Bourne?"
+
+def test_non_overlapping_spans():
+    spans = [
+        {"label": "actor", "start": 19, "end": 29},
+        {"label": "character", "start": 35, "end": 47}
+    ]
+    annotation = preprocessing(TEXT, spans)
+    assert annotation["spans"] == spans, f"Preprocessed spans do not match input. Instead, got: {annotation['spans']}."
+
+def test_overlapping_spans():
+    spans = [
+        {"label": "actor", "start": 19, "end": 29},
+        {"label": "character", "start": 24, "end": 47}
+    ]
+    with pytest.raises(ValueError, match=r"Spans \d+.*and \d+.*overlap"):
+        preprocessing(TEXT, spans)
+
+def test_overlapping_spans_reversed_order():
+    spans = [
+        {"label": "character", "start": 24, "end": 47},
+        {"label": "actor", "start": 19, "end": 29}
+    ]
+    with pytest.raises(ValueError, match=r"Spans \d+.*and \d+.*overlap"):
+        preprocessing(TEXT, spans)
+
+def test_adjacent_spans():
+    # spans ending exactly where the next begins do not overlap (ends are exclusive)
+    spans = [
+        {"label": "actor", "start": 19, "end": 23},
+        {"label": "actor", "start": 23, "end": 29}
+    ]
+    preprocessing(TEXT, spans)
+
+def test_validate_batch_with_custom_fields():
+    annotations = [
+        {"text": TEXT, "entities": [{"class": "actor", "start": 19, "end": 29}]},
+        {"text": TEXT, "entities": []}
+    ]
+    validated = validate_batch(annotations, spans_field="entities", label_field="class")
+    target = [
+        {"text": TEXT, "spans": [{"start": 19, "end": 29, "label": "actor"}]},
+        {"text": TEXT, "spans": []}
+    ]
+    assert validated == target, f"Validated batch does not match target. Instead, got: {validated}."
+
+def test_spans_sorted_by_start():
+    spans = [
+        {"label": "character", "start": 35, "end": 47},
+        {"label": "actor", "start": 19, "end": 29}
+    ]
+    annotation = preprocessing(TEXT, spans)
+    assert annotation["spans"] == spans[::-1], f"Preprocessed spans are not sorted by start index. Instead, got: {annotation['spans']}."
+
+@pytest.mark.parametrize("start,end", [(-1, 5), (29, 19), (19, 19), (35, 100)])
+def test_invalid_span_range(start, end):
+    spans = [{"label": "actor", "start": start, "end": end}]
+    with pytest.raises(ValueError, match=r"must satisfy"):
+        preprocessing(TEXT, spans)
+    with pytest.raises(ValueError, match=r"must satisfy"):
+        preprocessing(TEXT, spans, strict_validate=True)
+
+@pytest.mark.parametrize("strict_validate", [False, True], ids=["default", "strict"])
+def test_validation_paths_agree(strict_validate):
+    span = {"label": "actor", "start": 19, "end": 29}
+    # tuples of spans are accepted by both paths
+    annotation = preprocessing(TEXT, (span,), strict_validate=strict_validate)
+    assert annotation["spans"] == [span], f"Preprocessed spans do not match input. Instead, got: {annotation['spans']}."
+    with pytest.raises(ValueError, match=r"missing field 'label'"):
+        preprocessing(TEXT, [{"start": 19, "end": 29}], strict_validate=strict_validate)
+    with pytest.raises(TypeError):
+        preprocessing(TEXT, [{**span, "start": True}], strict_validate=strict_validate)
+    with pytest.raises(TypeError):
+        preprocessing(TEXT, [(19, 29, "actor")], strict_validate=strict_validate)
+    with pytest.raises(TypeError):
+        preprocessing(TEXT, span, strict_validate=strict_validate)